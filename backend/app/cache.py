@@ -0,0 +1,80 @@
+# backend/app/cache.py
+"""
+Two-tier cache for serialized analysis results
+"""
+
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from cachetools import TTLCache
+from diskcache import Cache
+
+# Bump when the parser output or cached response shapes change, so entries
+# written by an older version are never served
+CACHE_VERSION = 3
+
+
+class CachedAnalysis(NamedTuple):
+    """Serialized JSON responses kept per analysis ID"""
+    analysis: bytes  # AnalysisResponse
+    graph: bytes  # GraphResponse
+
+
+class AnalysisCache:
+    """
+    Analysis cache keyed by analysis ID
+
+    A bounded in-process TTL cache sits in front of a diskcache store.
+    The disk tier is shared by every worker process and survives reloads,
+    so an analysis parsed by one worker is reused by the others.
+    """
+
+    def __init__(self, directory: Path, maxsize: int, ttl: int, size_limit: int):
+        self.ttl = ttl
+        self._memory: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._disk = Cache(str(directory), size_limit=size_limit)
+
+    @staticmethod
+    def _disk_key(analysis_id: str) -> str:
+        return f"v{CACHE_VERSION}:{analysis_id}"
+
+    def get(self, analysis_id: str) -> Optional[CachedAnalysis]:
+        """
+        Look up an analysis, promoting disk hits into the memory tier
+
+        Args:
+            analysis_id: Unique identifier for the analysis
+
+        Returns:
+            Optional[CachedAnalysis]: Cached responses, or None on a miss
+        """
+        cached = self._memory.get(analysis_id)
+        if cached is not None:
+            return cached
+
+        cached = self._disk.get(self._disk_key(analysis_id))
+        if cached is not None:
+            self._memory[analysis_id] = cached
+        return cached
+
+    def set(self, analysis_id: str, cached: CachedAnalysis) -> None:
+        """
+        Store an analysis in both tiers
+
+        Args:
+            analysis_id: Unique identifier for the analysis
+            cached: Rendered responses to store
+        """
+        self._memory[analysis_id] = cached
+        self._disk.set(self._disk_key(analysis_id), cached, expire=self.ttl)
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the shared disk tier is kept)"""
+        self._memory.clear()
+
+    def close(self) -> None:
+        """Release the disk tier handle"""
+        self._disk.close()
+
+    def __len__(self) -> int:
+        return len(self._memory)
@@ -3,9 +3,11 @@
 Configuration settings for ROS Code Intelligence Platform
 """
 
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import List
-from pydantic_settings import BaseSettings
+from typing import FrozenSet, List, Optional, Tuple
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -35,24 +37,50 @@ class Settings(BaseSettings):
     TEMP_EXTRACT_DIR: Path = Path("extracted_projects")
     
     # Parser Settings
-    RELEVANT_EXTENSIONS: List[str] = [
+    # Frozen collections: these are looked up for every walked file
+    RELEVANT_EXTENSIONS: FrozenSet[str] = frozenset({
         ".py", ".cpp", ".c", ".h", ".hpp",
         ".launch", ".xml", ".yaml", ".yml"
-    ]
+    })
     
-    IGNORED_PATHS: List[str] = [
+    IGNORED_PATHS: Tuple[str, ...] = (
         "/build/", "/devel/", "/install/", 
         "/log/", "/__pycache__/", ".pyc", ".pyo"
-    ]
+    )
+    
+    # Directory names pruned from project walks (generated catkin/colcon
+    # output, VCS metadata and tooling environments)
+    IGNORED_DIRS: FrozenSet[str] = frozenset({
+        "build", "devel", "install", "log", "__pycache__", ".git",
+        "node_modules", ".venv", "venv", ".tox"
+    })
+    
+    # Parallel parsing (process pool created at startup)
+    PARSE_WORKERS: Optional[int] = None  # None → one worker per CPU
+    PARSE_PARALLEL_MIN_FILES: int = 32  # smaller projects are parsed inline
+    EXTRACT_WORKERS: Optional[int] = None  # ZIP extraction threads, None → default
     
     # Cache Settings
     ENABLE_CACHE: bool = True
     CACHE_TTL: int = 3600  # 1 hour in seconds
+    CACHE_MAX_ENTRIES: int = 64  # analyses kept in memory
+    CACHE_DIR: Path = Path(".cache/analysis")  # disk tier shared by workers
+    CACHE_SIZE_LIMIT: int = 1024 * 1024 * 1024  # 1 GB
+    PARSE_CACHE_SIZE: int = 10000  # per-file parse results kept in memory
+    PARSE_CACHE_DIR: Path = Path(".cache/parse")  # per-file results on disk
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings instance (parsed once)"""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
+
+# IGNORED_PATHS merged into one compiled alternation, shared by the parser
+# and the file tree so both filters stay identical
+IGNORED_PATHS_RE = re.compile("|".join(map(re.escape, settings.IGNORED_PATHS)) or r"(?!)")
\ No newline at end of file
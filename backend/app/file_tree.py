@@ -3,45 +3,104 @@
 File tree builder for project structure visualization
 """
 
+import os
 from pathlib import Path
-from typing import List
-from .models import FileNode
-from .config import settings
+from typing import Any, Dict, Iterator, Tuple
+from .config import IGNORED_PATHS_RE, settings
 
 
-def is_relevant_file(path: Path) -> bool:
+# Filters precomputed once at import for the per-entry relevance check
+_RELEVANT_EXTS = frozenset(ext.lower() for ext in settings.RELEVANT_EXTENSIONS)
+_IGNORED_RE = IGNORED_PATHS_RE
+
+
+def is_relevant_file(entry: os.DirEntry, path_str: str) -> bool:
     """
-    Check if file is relevant for display
+    Check if directory entry is relevant for display
     
     Args:
-        path: File path to check
+        entry: Directory entry to check
+        path_str: Full path of the entry
         
     Returns:
-        bool: True if file should be included in tree
+        bool: True if entry should be included in tree
     """
     # Check if path contains ignored directories
-    path_str = str(path).lower()
-    for ignored in settings.IGNORED_PATHS:
-        if ignored in path_str:
-            return False
+    if _IGNORED_RE.search(path_str.lower()):
+        return False
+    
+    # Directories are always kept, files are filtered by extension
+    if entry.is_dir(follow_symlinks=False):
+        return True
     
-    # Check file extension
-    if path.is_file():
-        return path.suffix.lower() in settings.RELEVANT_EXTENSIONS
+    return os.path.splitext(entry.name)[1].lower() in _RELEVANT_EXTS
+
+
+def _iter_children(dir_path: str, rel_prefix: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Lazily yield the relevant children of a single directory
+    
+    Args:
+        dir_path: Directory to scan
+        rel_prefix: Relative path of the directory ("" for the base)
+        
+    Yields:
+        Tuple[str, Dict[str, Any]]: Entry path and its tree node, in display order
+    """
+    try:
+        with os.scandir(dir_path) as it:
+            entries = sorted(
+                it,
+                key=lambda e: (not e.is_dir(follow_symlinks=False), e.name.lower())
+            )
+    except PermissionError:
+        # Can't read directory, yield no children
+        return
     
-    return True
+    for entry in entries:
+        # Skip hidden files and ignored paths
+        if entry.name.startswith('.'):
+            continue
+        
+        if not is_relevant_file(entry, entry.path):
+            continue
+        
+        # Prune generated directories (build/, devel/, ...) by name
+        if entry.name.lower() in settings.IGNORED_DIRS and entry.is_dir(follow_symlinks=False):
+            continue
+        
+        try:
+            entry_is_dir = entry.is_dir(follow_symlinks=False)
+            child = {
+                "name": entry.name,
+                "path": os.path.join(rel_prefix, entry.name),
+                "type": "folder" if entry_is_dir else "file",
+                "size": None if entry_is_dir else entry.stat(follow_symlinks=False).st_size,
+                "children": [] if entry_is_dir else None,
+            }
+        except OSError:
+            # Skip problematic files but continue processing
+            continue
+        
+        yield entry.path, child
 
 
-def build_file_tree(path: Path, base_path: Path = None) -> FileNode:
+def build_file_tree(path: Path, base_path: Path = None) -> Dict[str, Any]:
     """
-    Recursively build file tree structure
+    Build file tree structure with an iterative os.scandir walk
+    
+    Directory entries are read with os.scandir so the type and size
+    information cached on each DirEntry is reused instead of issuing
+    extra stat calls, and an explicit stack replaces recursion.
+    Nodes are plain dicts shaped like FileNode, so large trees skip
+    per-node pydantic validation and serialize directly with orjson.
     
     Args:
-        path: Current path to process
+        path: Root path to process
         base_path: Base path for relative path calculation
         
     Returns:
-        FileNode: File tree node
+        Dict[str, Any]: FileNode-shaped tree node
         
     Raises:
         ValueError: If path doesn't exist
@@ -60,40 +119,33 @@ def build_file_tree(path: Path, base_path: Path = None) -> FileNode:
     except ValueError:
         rel_path = path
     
-    # Create node
-    node = FileNode(
-        name=path.name or "root",
-        path=str(rel_path),
-        type="folder" if is_dir else "file",
-        size=path.stat().st_size if not is_dir else None,
-        children=[] if is_dir else None
-    )
+    # Create root node
+    root = {
+        "name": path.name or "root",
+        "path": str(rel_path),
+        "type": "folder" if is_dir else "file",
+        "size": path.stat().st_size if not is_dir else None,
+        "children": [] if is_dir else None,
+    }
     
-    # Process children for directories
-    if is_dir:
-        try:
-            children: List[FileNode] = []
-            
-            for item in sorted(path.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower())):
-                # Skip hidden files and ignored paths
-                if item.name.startswith('.'):
-                    continue
-                
-                if not is_relevant_file(item):
-                    continue
-                
-                # Recursively build child node
-                try:
-                    child = build_file_tree(item, base_path)
-                    children.append(child)
-                except Exception as e:
-                    # Skip problematic files but continue processing
-                    continue
-            
-            node.children = children if children else None
-            
-        except PermissionError:
-            # Can't read directory, leave children as empty
-            pass
+    if not is_dir:
+        return root
+    
+    # Each stack item is (directory path, relative path prefix, tree node)
+    stack = [(str(path), "" if root["path"] == "." else root["path"], root)]
+    
+    while stack:
+        dir_path, dir_rel, node = stack.pop()
+        
+        # Children are appended straight from the generator, so no
+        # intermediate list is held next to the node's own children
+        children = node["children"]
+        for child_path, child in _iter_children(dir_path, dir_rel):
+            children.append(child)
+            if child["type"] == "folder":
+                stack.append((child_path, child["path"], child))
+        
+        if not children:
+            node["children"] = None
     
-    return node
\ No newline at end of file
+    return root
@@ -5,29 +5,38 @@ Author: Haifa Jendoubi
 Date: January 31, 2026
 """
 
+import os
 import uuid
+import asyncio
 import zipfile
 import shutil
-import aiofiles
 import logging
+import multiprocessing
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, BinaryIO, Dict, Optional
 from contextlib import asynccontextmanager
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+import orjson
 from fastapi import FastAPI, UploadFile, File, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 
 from .models import (
     UploadResponse,
     TreeResponse,
     AnalysisResponse,
+    NodeInfo,
+    TopicInfo,
+    ServiceInfo,
     GraphResponse,
     HealthResponse,
     ErrorResponse
 )
 from .parsers import RosModel, parse_project
 from .file_tree import build_file_tree
+from .cache import AnalysisCache, CachedAnalysis
 from .config import settings
 
 # Configure logging
@@ -37,25 +46,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global cache for parsed models
-analysis_cache: Dict[str, RosModel] = {}
+# Rendered analyses: bounded in-memory tier + disk tier shared by workers
+# (created at startup)
+analysis_cache: Optional[AnalysisCache] = None
+
+# Process pool shared by all requests for per-file parsing (created at startup)
+parse_executor: Optional[ProcessPoolExecutor] = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
+    global analysis_cache, parse_executor
+    
     # Startup
     logger.info("🚀 Starting ROS Code Intelligence Platform")
     settings.BASE_UPLOAD_DIR.mkdir(exist_ok=True)
     settings.TEMP_EXTRACT_DIR.mkdir(exist_ok=True)
-    logger.info(f"📁 Upload directory: {settings.BASE_UPLOAD_DIR}")
-    logger.info(f"📁 Extract directory: {settings.TEMP_EXTRACT_DIR}")
+    logger.info("📁 Upload directory: %s", settings.BASE_UPLOAD_DIR)
+    logger.info("📁 Extract directory: %s", settings.TEMP_EXTRACT_DIR)
+    analysis_cache = AnalysisCache(
+        directory=settings.CACHE_DIR,
+        maxsize=settings.CACHE_MAX_ENTRIES,
+        ttl=settings.CACHE_TTL,
+        size_limit=settings.CACHE_SIZE_LIMIT
+    )
+    # Workers are started lazily from an asyncio.to_thread worker while the
+    # event loop is running; forking a multi-threaded process can deadlock,
+    # so they come from a forkserver (spawn where it is unavailable)
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    parse_executor = ProcessPoolExecutor(
+        max_workers=settings.PARSE_WORKERS,
+        mp_context=multiprocessing.get_context(start_method)
+    )
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down ROS Code Intelligence Platform")
     analysis_cache.clear()
+    analysis_cache.close()
+    parse_executor.shutdown()
+    parse_executor = None
 
 
 # FastAPI Application
@@ -91,7 +123,9 @@ app = FastAPI(
         "name": "MIT License",
         "url": "https://opensource.org/licenses/MIT"
     },
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes the large analysis/graph payloads much faster
+    default_response_class=ORJSONResponse
 )
 
 # CORS Middleware
@@ -104,6 +138,68 @@ app.add_middleware(
 )
 
 
+# Copy buffer for ZIP member extraction (zipfile's default is much smaller)
+ZIP_COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def extract_zip(source: BinaryIO, extract_folder: Path) -> int:
+    """
+    Extract a ZIP archive into the given folder
+    
+    Reads directly from the uploaded file object (FastAPI's spooled
+    temporary file), so the archive is never copied to disk first.
+    Members are streamed out with a large copy buffer to cut the number
+    of read/write calls, and decompressed concurrently on a thread pool
+    (zlib releases the GIL; ZipFile serializes reads of the shared handle).
+    Blocking: run it in a worker thread from async code.
+    
+    Args:
+        source: Seekable binary file object containing the archive
+        extract_folder: Destination directory
+        
+    Returns:
+        int: Number of files extracted
+        
+    Raises:
+        zipfile.BadZipFile: If the archive is invalid
+        ValueError: If a member would be extracted outside the folder
+    """
+    # Resolved once; members are then checked with pure string operations
+    root = str(extract_folder.resolve())
+    root_prefix = root + os.sep
+    
+    with zipfile.ZipFile(source, "r") as z:
+        # Validate paths and create directories serially; a later member
+        # with the same name wins, as with extractall
+        files = {}
+        created_dirs = {root}
+        for info in z.infolist():
+            target = os.path.normpath(os.path.join(root, info.filename))
+            
+            # Reject absolute paths and ".." entries (zip slip)
+            if target != root and not target.startswith(root_prefix):
+                raise ValueError(f"Unsafe path in archive: {info.filename}")
+            
+            directory = target if info.is_dir() else os.path.dirname(target)
+            if directory not in created_dirs:
+                os.makedirs(directory, exist_ok=True)
+                created_dirs.add(directory)
+            
+            if not info.is_dir():
+                files[target] = info
+        
+        def extract_member(item) -> None:
+            target, info = item
+            with z.open(info) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, ZIP_COPY_BUFFER_SIZE)
+        
+        with ThreadPoolExecutor(max_workers=settings.EXTRACT_WORKERS) as pool:
+            # list() re-raises the first member error, if any
+            list(pool.map(extract_member, files.items()))
+    
+    return len(files)
+
+
 # Exception Handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -119,7 +215,7 @@ async def http_exception_handler(request, exc):
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=ErrorResponse(
@@ -221,53 +317,31 @@ async def upload_and_extract_zip(
     
     # Generate unique analysis ID
     analysis_id = uuid.uuid4().hex[:12]
-    zip_path = settings.BASE_UPLOAD_DIR / f"{analysis_id}_{file.filename}"
     
-    logger.info(f"📤 Uploading file: {file.filename} (Analysis ID: {analysis_id})")
-    
-    # Save uploaded file
-    try:
-        async with aiofiles.open(zip_path, "wb") as f:
-            while chunk := await file.read(1024 * 1024):  # 1MB chunks
-                await f.write(chunk)
-    except Exception as e:
-        logger.error(f"Failed to save uploaded file: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save uploaded file: {str(e)}"
-        )
+    logger.info("📤 Uploading file: %s (Analysis ID: %s)", file.filename, analysis_id)
     
-    # Extract ZIP
+    # Extract ZIP straight from the spooled upload, off the event loop
     extract_folder = settings.TEMP_EXTRACT_DIR / analysis_id
     extract_folder.mkdir(exist_ok=True)
     
     try:
-        with zipfile.ZipFile(zip_path, "r") as z:
-            z.extractall(extract_folder)
-        logger.info(f"✅ Successfully extracted to: {extract_folder}")
+        file_count = await asyncio.to_thread(extract_zip, file.file, extract_folder)
+        logger.info("✅ Successfully extracted to: %s", extract_folder)
     except zipfile.BadZipFile:
         shutil.rmtree(extract_folder, ignore_errors=True)
-        zip_path.unlink(missing_ok=True)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid ZIP file. The file appears to be corrupted."
         )
     except Exception as e:
         shutil.rmtree(extract_folder, ignore_errors=True)
-        zip_path.unlink(missing_ok=True)
-        logger.error(f"Extraction failed: {str(e)}")
+        logger.error("Extraction failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Extraction failed: {str(e)}"
         )
     
-    # Clean up ZIP file
-    zip_path.unlink(missing_ok=True)
-    
-    # Count extracted files
-    file_count = sum(1 for _ in extract_folder.rglob("*") if _.is_file())
-    
-    logger.info(f"📊 Extracted {file_count} files")
+    logger.info("📊 Extracted %s files", file_count)
     
     return UploadResponse(
         status="success",
@@ -302,13 +376,13 @@ async def get_project_tree(analysis_id: str):
     project_dir = settings.TEMP_EXTRACT_DIR / analysis_id
     
     if not project_dir.is_dir():
-        logger.warning(f"Project not found: {analysis_id}")
+        logger.warning("Project not found: %s", analysis_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with ID '{analysis_id}' not found. Please upload a project first."
         )
     
-    logger.info(f"🌳 Building file tree for: {analysis_id}")
+    logger.info("🌳 Building file tree for: %s", analysis_id)
     
     # Find root directory (handle single-folder ZIPs)
     contents = list(project_dir.iterdir())
@@ -316,16 +390,17 @@ async def get_project_tree(analysis_id: str):
     
     try:
         tree = build_file_tree(root_dir)
-        logger.info(f"✅ File tree built successfully")
+        logger.info("✅ File tree built successfully")
         
-        return TreeResponse(
-            status="success",
-            analysis_id=analysis_id,
-            root_name=root_dir.name,
-            tree=tree
-        )
+        # Plain dict tree: returned as-is, without response model validation
+        return ORJSONResponse({
+            "status": "success",
+            "analysis_id": analysis_id,
+            "root_name": root_dir.name,
+            "tree": tree,
+        })
     except Exception as e:
-        logger.error(f"Failed to build file tree: {str(e)}")
+        logger.error("Failed to build file tree: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to build file tree: {str(e)}"
@@ -352,131 +427,185 @@ async def analyze_project(analysis_id: str):
     Raises:
         HTTPException: If project not found or analysis fails
     """
+    logger.info("🔍 Analyzing project: %s", analysis_id)
+    
+    # Pre-serialized JSON: no response model validation or encoding per request
+    return Response((await load_analysis(analysis_id)).analysis, media_type="application/json")
+
+
+@app.get(
+    "/api/graph/{analysis_id}",
+    response_model=GraphResponse,
+    summary="Get Communication Graph",
+    description="Generate interactive communication graph showing nodes, topics, and connections",
+    tags=["Graph"]
+)
+async def get_communication_graph(analysis_id: str):
+    """
+    Get communication graph for visualization
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        
+    Returns:
+        GraphResponse: Graph nodes and edges for visualization
+        
+    Raises:
+        HTTPException: If project not found
+    """
+    logger.info("🎨 Generating communication graph for: %s", analysis_id)
+    
+    # Pre-serialized JSON: no response model validation or encoding per request
+    return Response((await load_analysis(analysis_id)).graph, media_type="application/json")
+
+
+# ============================================
+# ANALYSIS HELPERS
+# ============================================
+
+async def load_analysis(analysis_id: str) -> CachedAnalysis:
+    """
+    Get the serialized analysis and graph of a project, parsing it on a cache miss
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        
+    Returns:
+        CachedAnalysis: Ready-to-send analysis and graph JSON bodies
+        
+    Raises:
+        HTTPException: If project not found or parsing fails
+    """
     project_dir = settings.TEMP_EXTRACT_DIR / analysis_id
     
     if not project_dir.is_dir():
-        logger.warning(f"Project not found: {analysis_id}")
+        logger.warning("Project not found: %s", analysis_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with ID '{analysis_id}' not found"
         )
     
-    logger.info(f"🔍 Analyzing project: {analysis_id}")
-    
-    # Check cache
-    if analysis_id not in analysis_cache:
-        try:
-            analysis_cache[analysis_id] = parse_project(project_dir)
-            logger.info(f"✅ Project parsed and cached")
-        except Exception as e:
-            logger.error(f"Failed to parse project: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to parse project: {str(e)}"
-            )
-    else:
-        logger.info(f"📦 Using cached analysis")
+    cached = analysis_cache.get(analysis_id)
+    if cached is not None:
+        logger.info("📦 Using cached analysis")
+        return cached
+    
+    # Parsing waits on the process pool: keep it off the event loop
+    try:
+        model = await asyncio.to_thread(parse_project, project_dir, parse_executor)
+    except Exception as e:
+        logger.error("Failed to parse project: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to parse project: {str(e)}"
+        )
+    
+    # Only the serialized responses are cached, not the RosModel itself;
+    # the analysis is validated once here, then served as raw JSON bytes
+    cached = CachedAnalysis(
+        analysis=orjson.dumps(build_analysis_response(analysis_id, model).model_dump()),
+        graph=orjson.dumps(build_graph_response(model))
+    )
+    analysis_cache.set(analysis_id, cached)
+    logger.info("✅ Project parsed and cached")
     
-    model = analysis_cache[analysis_id]
+    return cached
+
+
+def build_analysis_response(analysis_id: str, model: RosModel) -> AnalysisResponse:
+    """
+    Build the analysis response (metrics, behavior summary) from a parsed model
     
-    # Prepare response data
+    Args:
+        analysis_id: Unique identifier for the analysis
+        model: Parsed ROS model
+        
+    Returns:
+        AnalysisResponse: Complete analysis results including metrics and warnings
+    """
     topics_list = list(model.topics.values())
     services_list = list(model.services.values())
     
+    # Publisher/subscriber lists are deduplicated at insert by RosModel
     metrics = {
         "nodes_count": len(model.nodes),
         "topics_count": len(topics_list),
-        "publishers_count": sum(len(set(t.publishers)) for t in topics_list),
-        "subscribers_count": sum(len(set(t.subscribers)) for t in topics_list),
+        "publishers_count": sum(len(t.publishers) for t in topics_list),
+        "subscribers_count": sum(len(t.subscribers) for t in topics_list),
         "services_count": len(services_list),
         "parameters_count": len(model.parameters),
     }
     
-    # Generate behavior summary
-    behavior_lines = []
-    
-    if topics_list:
-        for t in topics_list:
-            p = ", ".join(set(t.publishers)) or "none"
-            s = ", ".join(set(t.subscribers)) or "none"
-            behavior_lines.append(f"• {t.name} ({t.message_type}): pub {p} → sub {s}")
-    
-    if services_list:
-        for s in services_list:
-            srv = ", ".join(s.servers) or "none"
-            cli = ", ".join(s.clients) or "none"
-            behavior_lines.append(f"• Service {s.name} ({s.type}): server {srv} ↔ client {cli}")
-    
-    behavior_summary = (
-        "**Detected ROS Communication:**\n\n" + "\n".join(behavior_lines)
-        if behavior_lines
-        else "No ROS communication patterns detected in this project."
-    )
-    
-    logger.info(f"📊 Analysis complete - Nodes: {metrics['nodes_count']}, Topics: {metrics['topics_count']}")
+    logger.info("📊 Analysis complete - Nodes: %s, Topics: %s", metrics['nodes_count'], metrics['topics_count'])
     
     return AnalysisResponse(
         status="analyzed",
         analysis_id=analysis_id,
-        nodes=model.nodes,
-        topics=topics_list,
-        services=services_list,
+        # Internal parser records are projected into the response models here
+        nodes=[NodeInfo(name=n.name, file=n.file) for n in model.nodes],
+        topics=[
+            TopicInfo(
+                name=t.name,
+                message_type=t.message_type,
+                publishers=t.publishers,
+                subscribers=t.subscribers
+            )
+            for t in topics_list
+        ],
+        services=[
+            ServiceInfo(name=s.name, type=s.type, servers=s.servers, clients=s.clients)
+            for s in services_list
+        ],
         parameters=list(model.parameters),
         metrics=metrics,
-        behavior_summary=behavior_summary,
+        behavior_summary=build_behavior_summary(model),
         warnings=model.warnings
     )
 
 
-@app.get(
-    "/api/graph/{analysis_id}",
-    response_model=GraphResponse,
-    summary="Get Communication Graph",
-    description="Generate interactive communication graph showing nodes, topics, and connections",
-    tags=["Graph"]
-)
-async def get_communication_graph(analysis_id: str):
+def build_behavior_summary(model: RosModel) -> str:
     """
-    Get communication graph for visualization
+    Format the markdown communication summary of a parsed model
     
     Args:
-        analysis_id: Unique identifier for the analysis
+        model: Parsed ROS model
         
     Returns:
-        GraphResponse: Graph nodes and edges for visualization
-        
-    Raises:
-        HTTPException: If project not found
+        str: One bullet per topic and service, or a fallback message
     """
-    project_dir = settings.TEMP_EXTRACT_DIR / analysis_id
-    
-    if not project_dir.is_dir():
-        logger.warning(f"Project not found: {analysis_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Project with ID '{analysis_id}' not found"
-        )
+    if not model.topics and not model.services:
+        return "No ROS communication patterns detected in this project."
     
-    logger.info(f"🎨 Generating communication graph for: {analysis_id}")
-    
-    # Parse if not cached
-    if analysis_id not in analysis_cache:
-        try:
-            analysis_cache[analysis_id] = parse_project(project_dir)
-        except Exception as e:
-            logger.error(f"Failed to parse project: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to parse project: {str(e)}"
-            )
+    topic_lines = (
+        f"• {t.name} ({t.message_type}): "
+        f"pub {', '.join(t.publishers) or 'none'} → sub {', '.join(t.subscribers) or 'none'}"
+        for t in model.topics.values()
+    )
+    service_lines = (
+        f"• Service {s.name} ({s.type}): "
+        f"server {', '.join(s.servers) or 'none'} ↔ client {', '.join(s.clients) or 'none'}"
+        for s in model.services.values()
+    )
     
-    model = analysis_cache[analysis_id]
+    return "**Detected ROS Communication:**\n\n" + "\n".join(chain(topic_lines, service_lines))
+
+
+def build_graph_response(model: RosModel) -> Dict[str, Any]:
+    """
+    Build the communication graph (nodes, topics, services and edges) from a parsed model
     
-    # Build graph
-    from .models import GraphNode, GraphEdge
+    Nodes and edges are plain dicts shaped like GraphNode/GraphEdge: the
+    data comes from our own parser, so per-object pydantic validation is
+    skipped and the payload goes straight to orjson.
     
+    Args:
+        model: Parsed ROS model
+        
+    Returns:
+        Dict[str, Any]: GraphResponse-shaped payload with nodes and edges
+    """
     nodes = [
-        GraphNode(id=n.name, label=n.name, type="node")
+        {"id": n.name, "label": n.name, "type": "node"}
         for n in model.nodes
     ]
     edges = []
@@ -484,48 +613,38 @@ async def get_communication_graph(analysis_id: str):
     # Add topics and connections
     for idx, topic in enumerate(model.topics.values()):
         tid = f"topic_{idx}"
-        nodes.append(GraphNode(id=tid, label=topic.name, type="topic"))
-        
-        for p in set(topic.publishers):
-            edges.append(GraphEdge(
-                id=f"pub_{p}_{tid}",
-                source=p,
-                target=tid,
-                label=topic.message_type
-            ))
+        nodes.append({"id": tid, "label": topic.name, "type": "topic"})
         
-        for s in set(topic.subscribers):
-            edges.append(GraphEdge(
-                id=f"sub_{tid}_{s}",
-                source=tid,
-                target=s,
-                label=""
-            ))
+        edges.extend(
+            {"id": f"pub_{p}_{tid}", "source": p, "target": tid,
+             "label": topic.message_type, "animated": True}
+            for p in topic.publishers
+        )
+        edges.extend(
+            {"id": f"sub_{tid}_{s}", "source": tid, "target": s,
+             "label": "", "animated": True}
+            for s in topic.subscribers
+        )
     
     # Add services and connections
     for idx, srv in enumerate(model.services.values()):
         sid = f"service_{idx}"
-        nodes.append(GraphNode(id=sid, label=srv.name, type="service"))
+        nodes.append({"id": sid, "label": srv.name, "type": "service"})
         
-        for server in srv.servers:
-            edges.append(GraphEdge(
-                id=f"srv_server_{server}_{sid}",
-                source=server,
-                target=sid,
-                label="provides"
-            ))
-        
-        for client in srv.clients:
-            edges.append(GraphEdge(
-                id=f"srv_client_{client}_{sid}",
-                source=client,
-                target=sid,
-                label="calls"
-            ))
+        edges.extend(
+            {"id": f"srv_server_{server}_{sid}", "source": server, "target": sid,
+             "label": "provides", "animated": True}
+            for server in srv.servers
+        )
+        edges.extend(
+            {"id": f"srv_client_{client}_{sid}", "source": client, "target": sid,
+             "label": "calls", "animated": True}
+            for client in srv.clients
+        )
     
-    logger.info(f"✅ Graph generated - Nodes: {len(nodes)}, Edges: {len(edges)}")
+    logger.info("✅ Graph generated - Nodes: %s, Edges: %s", len(nodes), len(edges))
     
-    return GraphResponse(nodes=nodes, edges=edges)
+    return {"nodes": nodes, "edges": edges}
 
 
 # Development server
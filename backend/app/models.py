@@ -4,7 +4,7 @@ Pydantic models for request/response validation
 """
 
 from typing import List, Optional, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ============================================
@@ -48,8 +48,8 @@ class FileNode(BaseModel):
     size: Optional[int] = Field(None, description="File size in bytes")
     children: Optional[List["FileNode"]] = Field(None, description="Child nodes")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "src",
                 "path": "my_package/src",
@@ -64,6 +64,7 @@ class FileNode(BaseModel):
                 ]
             }
         }
+    )
 
 
 class TreeResponse(BaseModel):
@@ -83,13 +84,14 @@ class NodeInfo(BaseModel):
     name: str = Field(..., description="Node name")
     file: str = Field(..., description="Source file path")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "camera_publisher",
                 "file": "src/camera_publisher.py"
             }
         }
+    )
 
 
 class TopicInfo(BaseModel):
@@ -99,8 +101,8 @@ class TopicInfo(BaseModel):
     publishers: List[str] = Field(default_factory=list, description="Publishing nodes")
     subscribers: List[str] = Field(default_factory=list, description="Subscribing nodes")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "/camera/image",
                 "message_type": "sensor_msgs/Image",
@@ -108,6 +110,7 @@ class TopicInfo(BaseModel):
                 "subscribers": ["image_processor"]
             }
         }
+    )
 
 
 class ServiceInfo(BaseModel):
@@ -117,8 +120,8 @@ class ServiceInfo(BaseModel):
     servers: List[str] = Field(default_factory=list, description="Service servers")
     clients: List[str] = Field(default_factory=list, description="Service clients")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "/camera/set_parameters",
                 "type": "std_srvs/SetParameters",
@@ -126,6 +129,7 @@ class ServiceInfo(BaseModel):
                 "clients": ["config_manager"]
             }
         }
+    )
 
 
 class AnalysisResponse(BaseModel):
@@ -140,8 +144,8 @@ class AnalysisResponse(BaseModel):
     behavior_summary: str = Field(..., description="Communication behavior summary")
     warnings: List[str] = Field(..., description="Code quality warnings")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "status": "analyzed",
                 "analysis_id": "abc123def456",
@@ -171,6 +175,7 @@ class AnalysisResponse(BaseModel):
                 "warnings": []
             }
         }
+    )
 
 
 # ============================================
@@ -183,14 +188,15 @@ class GraphNode(BaseModel):
     label: str = Field(..., description="Display label")
     type: str = Field(..., description="Node type: 'node', 'topic', or 'service'")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": "camera_publisher",
                 "label": "camera_publisher",
                 "type": "node"
             }
         }
+    )
 
 
 class GraphEdge(BaseModel):
@@ -201,8 +207,8 @@ class GraphEdge(BaseModel):
     label: str = Field(..., description="Edge label")
     animated: bool = Field(default=True, description="Animation flag")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": "pub_camera_publisher_topic_0",
                 "source": "camera_publisher",
@@ -211,6 +217,7 @@ class GraphEdge(BaseModel):
                 "animated": True
             }
         }
+    )
 
 
 class GraphResponse(BaseModel):
@@ -218,8 +225,8 @@ class GraphResponse(BaseModel):
     nodes: List[GraphNode] = Field(..., description="Graph nodes")
     edges: List[GraphEdge] = Field(..., description="Graph edges")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "nodes": [
                     {"id": "talker", "label": "talker", "type": "node"},
@@ -244,7 +251,4 @@ class GraphResponse(BaseModel):
                 ]
             }
         }
-
-
-# Update forward references
-FileNode.model_rebuild()
\ No newline at end of file
+    )
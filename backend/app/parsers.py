@@ -5,119 +5,272 @@ ROS project parser - version adaptée pour détecter chatter + talker/listener
 """
 
 import ast
+import hashlib
+import io
+import mmap
+import multiprocessing
+import os
+import sys
 import re
+import threading
+import time
 import xml.etree.ElementTree as ET
 import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Set, List, Dict, Optional
+from typing import Set, List, Dict, Iterator, Optional, Tuple
 
-from .models import NodeInfo, TopicInfo, ServiceInfo
-from .config import settings
+from diskcache import Cache
+
+# lxml (libxml2) est optionnel : plus rapide sur les gros fichiers launch,
+# repli sur ElementTree s'il n'est pas installé
+try:
+    from lxml import etree as _LXML
+except ImportError:
+    _LXML = None
+
+from .config import IGNORED_PATHS_RE, settings
 
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    "PARSER_VERSION",
+    "RosModel",
+    "ParsedFile",
+    "ROSASTVisitor",
+    "is_relevant_source_file",
+    "parse_python_ros_file",
+    "parse_cpp_ros_file",
+    "parse_launch_file",
+    "collect_project_files",
+    "parse_project",
+]
+
+
+# Conteneurs internes légers (__slots__, pas de validation pydantic) ;
+# projetés vers NodeInfo / TopicInfo / ServiceInfo à la sortie de l'API
+@dataclass
+class _Node:
+    __slots__ = ("name", "file")
+    name: str
+    file: str
+
+
+@dataclass
+class _Topic:
+    __slots__ = ("name", "message_type", "publishers", "subscribers")
+    name: str
+    message_type: str
+    publishers: List[str]
+    subscribers: List[str]
+
+
+@dataclass
+class _Service:
+    __slots__ = ("name", "type", "servers", "clients")
+    name: str
+    type: str
+    servers: List[str]
+    clients: List[str]
+
 
 class RosModel:
+    __slots__ = (
+        "nodes", "node_by_name", "topics", "services",
+        "parameters", "warnings", "_members"
+    )
+
     def __init__(self):
-        self.nodes: List[NodeInfo] = []
-        self.node_names: Set[str] = set()
-        self.topics: Dict[str, TopicInfo] = {}
-        self.services: Dict[str, ServiceInfo] = {}
+        self.nodes: List[_Node] = []
+        self.node_by_name: Dict[str, _Node] = {}
+        self.topics: Dict[str, _Topic] = {}
+        self.services: Dict[str, _Service] = {}
         self.parameters: Set[str] = set()
         self.warnings: List[str] = []
-
-    def add_node(self, name: str, file_path: Path, base_path: Path):
-        try:
-            clean_file = str(file_path.relative_to(base_path))
-        except ValueError:
-            clean_file = file_path.name
-
-        is_launch = file_path.suffix.lower() in ('.launch', '.xml')
-
-        if name in self.node_names:
-            existing = next((n for n in self.nodes if n.name == name), None)
-            if existing:
-                # Cas fréquent dans les tutos : talker et talker_timer
-                if "timer" in clean_file.lower() and "talker" in name.lower():
-                    self.nodes.append(NodeInfo(name=f"{name}_timer", file=clean_file))
-                    self.node_names.add(f"{name}_timer")
-                    logger.debug(f"Ajout variante timer: {name}_timer")
-                    return
-                # Sinon on garde le premier (généralement le principal)
-                self.warnings.append(
-                    f"Duplicate node '{name}' → using {existing.file}, ignoring {clean_file}"
-                )
+        # Sets miroirs des listes pub/sub/server/client → dédup en O(1)
+        self._members: Dict[Tuple[str, str], Set[str]] = {}
+
+    def add_node(self, name: str, clean_file: str):
+        # clean_file : chemin relatif au projet, calculé une fois par fichier
+        # par l'appelant (et non à chaque nœud)
+        existing = self.node_by_name.get(name)
+        if existing:
+            # Cas fréquent dans les tutos : talker et talker_timer
+            if "timer" in clean_file.lower() and "talker" in name.lower():
+                info = _Node(f"{name}_timer", clean_file)
+                self.nodes.append(info)
+                self.node_by_name[info.name] = info
+                logger.debug("Ajout variante timer: %s_timer", name)
                 return
+            # Sinon on garde le premier (généralement le principal)
+            self.warnings.append(
+                f"Duplicate node '{name}' → using {existing.file}, ignoring {clean_file}"
+            )
+            return
 
-        self.node_names.add(name)
-        self.nodes.append(NodeInfo(name=name, file=clean_file))
-        logger.debug(f"Added node: {name} from {clean_file}")
+        info = _Node(name, clean_file)
+        self.nodes.append(info)
+        self.node_by_name[name] = info
+        logger.debug("Added node: %s from %s", name, clean_file)
+
+    def _add_member(self, key: Tuple[str, str], target: List[str], node: str):
+        members = self._members.setdefault(key, set())
+        if node not in members:
+            members.add(node)
+            target.append(node)
 
     def add_pub(self, topic: str, msg_type: str, node: str):
         if topic not in self.topics:
-            self.topics[topic] = TopicInfo(
-                name=topic,
-                message_type=msg_type or "unknown",
-                publishers=[],
-                subscribers=[]
-            )
-        if node not in self.topics[topic].publishers:
-            self.topics[topic].publishers.append(node)
+            self.topics[topic] = _Topic(topic, msg_type or "unknown", [], [])
+        self._add_member(("pub", topic), self.topics[topic].publishers, node)
 
     def add_sub(self, topic: str, msg_type: str, node: str):
         if topic not in self.topics:
-            self.topics[topic] = TopicInfo(
-                name=topic,
-                message_type=msg_type or "unknown",
-                publishers=[],
-                subscribers=[]
-            )
-        if node not in self.topics[topic].subscribers:
-            self.topics[topic].subscribers.append(node)
+            self.topics[topic] = _Topic(topic, msg_type or "unknown", [], [])
+        self._add_member(("sub", topic), self.topics[topic].subscribers, node)
 
     def add_service(self, service: str, srv_type: str, node: str, is_server: bool):
         if service not in self.services:
-            self.services[service] = ServiceInfo(
-                name=service,
-                type=srv_type or "unknown",
-                servers=[],
-                clients=[]
-            )
-        target = self.services[service].servers if is_server else self.services[service].clients
-        if node not in target:
-            target.append(node)
+            self.services[service] = _Service(service, srv_type or "unknown", [], [])
+        if is_server:
+            self._add_member(("server", service), self.services[service].servers, node)
+        else:
+            self._add_member(("client", service), self.services[service].clients, node)
 
     def add_param(self, param: str):
         self.parameters.add(param)
 
 
-def is_relevant_source_file(path: Path) -> bool:
-    path_str = str(path).lower()
-    for ignored in settings.IGNORED_PATHS:
-        if ignored in path_str:
-            return False
+class ParsedFile:
+    """
+    Résultat du parsing d'un seul fichier, indépendant du RosModel.
+    Picklable, donc calculable dans un process worker puis rejoué
+    dans le modèle par le coordinateur (apply).
+    """
+
+    __slots__ = (
+        "nodes", "current_node", "pubs", "subs",
+        "services", "params", "warnings"
+    )
+
+    def __init__(self):
+        self.nodes: List[str] = []
+        self.current_node: Optional[str] = None
+        self.pubs: List[Tuple[str, str]] = []
+        self.subs: List[Tuple[str, str]] = []
+        self.services: List[Tuple[str, str, bool]] = []
+        self.params: List[str] = []
+        self.warnings: List[str] = []
+
+    def apply(self, model: RosModel, clean_file: str):
+        # Les chaînes arrivent dépicklées des workers (une copie par fichier) :
+        # noms de nœuds et de topics/services internés, une seule instance
+        # partagée par tout le modèle et des comparaisons par identité
+        intern = sys.intern
+        for name in self.nodes:
+            model.add_node(intern(name), clean_file)
+
+        if self.current_node:
+            node = intern(self.current_node)
+            for t, m in self.pubs:
+                model.add_pub(intern(t), m, node)
+            for t, m in self.subs:
+                model.add_sub(intern(t), m, node)
+            for s, t, is_server in self.services:
+                model.add_service(intern(s), t, node, is_server)
+            for p in self.params:
+                model.add_param(p)
+
+        model.warnings.extend(self.warnings)
 
-    # Fichiers non-ROS classiques (évite les erreurs)
-    skip_keywords = {"lexer", "parser", "buchi", "promela", "ltl", "spin", "modelcheck", "ts", "discrete", "product"}
-    if any(kw in path.stem.lower() for kw in skip_keywords):
+
+# Suffixes (en minuscules) par famille de parser, tests O(1)
+_CPP_SUFFIXES = frozenset({'.cpp', '.c', '.h', '.hpp'})
+_LAUNCH_SUFFIXES = frozenset({'.launch', '.xml'})
+
+
+# Taille de l'en-tête lu pour détecter les scripts générés par catkin
+_GENERATED_HEAD_SIZE = 4096
+
+# Fichiers non-ROS classiques (évite les erreurs), construit une seule fois
+_SKIP_KEYWORDS = frozenset({
+    "lexer", "parser", "buchi", "promela", "ltl", "spin",
+    "modelcheck", "ts", "discrete", "product"
+})
+
+
+# Chemins ignorés fusionnés en une seule alternation compilée (une passe
+# sur le chemin au lieu d'un test `in` par motif), partagée avec file_tree
+_IGNORED_RE = IGNORED_PATHS_RE
+
+
+@lru_cache(maxsize=4096)
+def _dir_is_relevant(dir_path: str) -> bool:
+    # Mémoïsé : tous les fichiers d'un même dossier partagent le résultat
+    return not _IGNORED_RE.search(dir_path.lower() + os.sep)
+
+
+def _file_is_relevant(name: str, suffix: str) -> bool:
+    # Tests sur le seul nom du fichier, sans construire de Path
+    lower = name.lower()
+    if _IGNORED_RE.search(lower):
+        return False
+
+    # Extension testée avant toute lecture (lookup O(1) dans le frozenset)
+    if suffix not in settings.RELEVANT_EXTENSIONS:
         return False
 
-    if path.suffix == '.py':
+    stem = lower[:len(lower) - len(suffix)]
+    return not any(kw in stem for kw in _SKIP_KEYWORDS)
+
+
+def is_relevant_source_file(
+    path: Path, content: Optional[bytes] = None, suffix: Optional[str] = None
+) -> bool:
+    # Chemins ignorés testés au niveau du dossier (une fois par dossier),
+    # puis extension et mots-clés sur le nom du fichier
+    dir_path, name = os.path.split(os.fspath(path))
+    # suffix déjà en minuscules quand il vient du dispatch
+    if suffix is None:
+        suffix = os.path.splitext(name)[1].lower()
+    if not _dir_is_relevant(dir_path) or not _file_is_relevant(name, suffix):
+        return False
+
+    # Le marqueur catkin est dans l'en-tête : seuls les premiers octets sont lus
+    if suffix == '.py':
         try:
-            content = path.read_text(errors="ignore", encoding="utf-8")
-            if "generated from catkin/cmake/template" in content:
+            if content is None:
+                with open(path, 'rb') as f:
+                    head = f.read(_GENERATED_HEAD_SIZE)
+            else:
+                head = content[:_GENERATED_HEAD_SIZE]
+            if b"generated from catkin/cmake/template" in head:
                 return False
-        except:
+        except OSError:
+            # En-tête illisible → le fichier reste considéré pertinent
             pass
 
-    return path.suffix.lower() in settings.RELEVANT_EXTENSIONS
+    return True
+
 
+def _first_per_topic(pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Garde le premier (topic, type) de chaque topic, dans l'ordre d'apparition"""
+    first: Dict[str, str] = {}
+    for topic, msg_type in pairs:
+        first.setdefault(topic, msg_type)
+    return list(first.items())
 
-class ROSASTVisitor(ast.NodeVisitor):
-    def __init__(self, model: RosModel, filepath: Path, base_path: Path):
-        self.model = model
-        self.filepath = filepath
-        self.base_path = base_path
+
+class ROSASTVisitor:
+    __slots__ = (
+        "result", "current_node", "pubs", "subs", "services",
+        "action_clients", "params", "has_rate"
+    )
+
+    def __init__(self, result: ParsedFile):
+        self.result = result
         self.current_node: Optional[str] = None
         self.pubs = []
         self.subs = []
@@ -147,57 +300,88 @@ class ROSASTVisitor(ast.NodeVisitor):
             return ".".join(parts)
         return "unknown"
 
-    def visit_Call(self, node):
-        if not isinstance(node.func, ast.Attribute):
-            self.generic_visit(node)
-            return
+    # Handlers des appels rospy.XXX
+    def _on_init_node(self, node):
+        if node.args:
+            name = self._extract_string_value(node.args[0])
+            if name:
+                self.current_node = name
+                self.result.nodes.append(name)
+
+    def _on_publisher(self, node):
+        if len(node.args) >= 2:
+            topic = self._extract_string_value(node.args[0])
+            if topic:
+                msg_type = self._get_type(node.args[1])
+                self.pubs.append((topic, msg_type))
+
+    def _on_subscriber(self, node):
+        if len(node.args) >= 2:
+            topic = self._extract_string_value(node.args[0])
+            if topic:
+                msg_type = self._get_type(node.args[1])
+                self.subs.append((topic, msg_type))
+
+    def _on_rate(self, node):
+        self.has_rate = True
+
+    def _on_param(self, node):
+        if node.args:
+            param = self._extract_string_value(node.args[0])
+            if param:
+                self.params.append(param)
+
+    # actionlib → on le garde en warning mais pas en service pour l'instant
+    def _on_action_client(self, node):
+        if len(node.args) >= 2:
+            action_name = self._extract_string_value(node.args[0])
+            if action_name:
+                self.result.warnings.append(
+                    f"Action client détecté mais non compté comme service : {action_name}"
+                )
 
-        # Lecture IMMÉDIATE de attr → évite UnboundLocalError
-        attr_name = node.func.attr
-        value = node.func.value
-
-        # rospy.XXX
-        if isinstance(value, ast.Name) and value.id == "rospy":
-            if attr_name == "init_node":
-                if node.args:
-                    name = self._extract_string_value(node.args[0])
-                    if name:
-                        self.current_node = name
-                        self.model.add_node(name, self.filepath, self.base_path)
-
-            elif attr_name == "Publisher":
-                if len(node.args) >= 2:
-                    topic = self._extract_string_value(node.args[0])
-                    if topic:
-                        msg_type = self._get_type(node.args[1])
-                        self.pubs.append((topic, msg_type))
-
-            elif attr_name == "Subscriber":
-                if len(node.args) >= 2:
-                    topic = self._extract_string_value(node.args[0])
-                    if topic:
-                        msg_type = self._get_type(node.args[1])
-                        self.subs.append((topic, msg_type))
-
-            elif attr_name == "Rate":
-                self.has_rate = True
-
-            elif attr_name in ("get_param", "set_param"):
-                if node.args:
-                    param = self._extract_string_value(node.args[0])
-                    if param:
-                        self.params.append(param)
-
-        # actionlib → on le garde en warning mais pas en service pour l'instant
-        elif attr_name == "SimpleActionClient" and isinstance(value, ast.Attribute):
-            if len(node.args) >= 2:
-                action_name = self._extract_string_value(node.args[0])
-                if action_name:
-                    self.model.warnings.append(
-                        f"Action client détecté mais non compté comme service : {action_name}"
-                    )
-
-        self.generic_visit(node)
+    # Dispatch rospy.<attr> → handler : une seule recherche dict par appel
+    # au lieu de la chaîne if/elif
+    _ROSPY_HANDLERS = {
+        "init_node": _on_init_node,
+        "Publisher": _on_publisher,
+        "Subscriber": _on_subscriber,
+        "Rate": _on_rate,
+        "get_param": _on_param,
+        "set_param": _on_param,
+    }
+
+    def _on_call(self, node):
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            value = func.value
+            # rospy.XXX
+            if isinstance(value, ast.Name) and value.id == "rospy":
+                handler = self._ROSPY_HANDLERS.get(func.attr)
+                if handler is not None:
+                    handler(self, node)
+            elif func.attr == "SimpleActionClient" and isinstance(value, ast.Attribute):
+                self._on_action_client(node)
+
+    def walk(self, tree):
+        # Parcours préfixe itératif, même ordre que ast.NodeVisitor, sans
+        # dispatch visit_* ni generic_visit récursif sur chaque nœud.
+        # (ast.walk est en largeur et changerait l'ordre des détections)
+        Call, AST = ast.Call, ast.AST
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if node.__class__ is Call:
+                self._on_call(node)
+            children = []
+            for field in node._fields:
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    children.extend(v for v in value if isinstance(v, AST))
+                elif isinstance(value, AST):
+                    children.append(value)
+            children.reverse()
+            stack.extend(children)
 
     def finalize(self):
         if not self.current_node:
@@ -205,86 +389,494 @@ class ROSASTVisitor(ast.NodeVisitor):
 
         has_comms = bool(self.pubs or self.subs)
 
-        for t, m in self.pubs:
-            self.model.add_pub(t, m, self.current_node)
-        for t, m in self.subs:
-            self.model.add_sub(t, m, self.current_node)
-        for s, t, is_server in self.services:
-            self.model.add_service(s, t, self.current_node, is_server)
-        for p in self.params:
-            self.model.add_param(p)
+        self.result.current_node = self.current_node
+        # Un seul nœud par fichier : seule la première déclaration d'un topic
+        # compte dans le modèle, les suivantes sont écartées ici en une passe
+        # (moins de données à sérialiser et d'appels add_pub/add_sub)
+        self.result.pubs.extend(_first_per_topic(self.pubs))
+        self.result.subs.extend(_first_per_topic(self.subs))
+        self.result.services.extend(self.services)
+        self.result.params.extend(self.params)
 
         # Warning Rate seulement si communications détectées
         if has_comms and not self.has_rate:
-            self.model.warnings.append(
+            self.result.warnings.append(
                 f"[{self.current_node}] Pas de rospy.Rate → possible boucle CPU intensive"
             )
 
 
-def parse_python_ros_file(filepath: Path, model: RosModel, base_path: Path):
-    if not is_relevant_source_file(filepath):
-        return
+# Fix-up print Python 2 → 3, compilé une seule fois à l'import ;
+# guillemets doubles et simples en une seule alternation (un seul passage)
+# appliqué directement sur les bytes (pas de décodage UTF-8 préalable)
+_PRINT_RE = re.compile(rb'''\bprint\s+("[^"]*"|'[^']*')''')
+
+
+def parse_python_ros_file(
+    filepath: Path, content: Optional[bytes] = None, suffix: Optional[str] = None
+) -> ParsedFile:
+    result = ParsedFile()
 
     try:
-        content = filepath.read_text(encoding="utf-8", errors="ignore")
-        # Petit fix Python 2/3 print
-        content = re.sub(r'\bprint\s+"([^"]*)"', r'print("\1")', content)
-        content = re.sub(r"\bprint\s+'([^']*)'", r"print('\1')", content)
-
-        tree = ast.parse(content, filename=str(filepath))
-        visitor = ROSASTVisitor(model, filepath, base_path)
-        visitor.visit(tree)
+        if content is None:
+            content = filepath.read_bytes()
+        # Pas de rospy dans le fichier → rien à détecter, pas d'AST
+        # (find plutôt que `in`, qui ne cherche pas de sous-chaîne sur un mmap)
+        if content.find(b"rospy") == -1:
+            return result
+        if not is_relevant_source_file(filepath, content, suffix):
+            return result
+
+        # ast.parse accepte les bytes (gère aussi les déclarations d'encodage)
+        try:
+            tree = ast.parse(content, filename=str(filepath))
+        except SyntaxError:
+            # Petit fix Python 2/3 print, seulement si le parse direct échoue
+            fixed, count = _PRINT_RE.subn(rb"print(\1)", content)
+            if not fixed.isascii():
+                # Octets non-ASCII : décodage tolérant, comme avant
+                fixed = fixed.decode("utf-8", errors="ignore")
+            elif not count:
+                # Rien n'a été réécrit → le re-parse échouerait pareil
+                raise
+            tree = ast.parse(fixed, filename=str(filepath))
+        visitor = ROSASTVisitor(result)
+        visitor.walk(tree)
         visitor.finalize()
 
     except SyntaxError as e:
-        model.warnings.append(f"SyntaxError {filepath.name}: {str(e)}")
+        result.warnings.append(f"SyntaxError {filepath.name}: {str(e)}")
     except Exception as e:
-        model.warnings.append(f"Parse error {filepath.name}: {str(e)}")
+        result.warnings.append(f"Parse error {filepath.name}: {str(e)}")
+
+    return result
 
 
 # C++ parser (très basique - on peut l'améliorer plus tard)
-def parse_cpp_ros_file(filepath: Path, model: RosModel, base_path: Path):
-    if filepath.suffix.lower() not in ('.cpp', '.c', '.h', '.hpp'):
-        return
+# Motif compilé une seule fois, appliqué sur les bytes (pas de décodage UTF-8)
+_ROS_INIT_RE = re.compile(rb'ros::init\s*\([^,]+,\s*["\']([^"\']+)["\']')
+
+
+def parse_cpp_ros_file(
+    filepath: Path, content: Optional[bytes] = None, suffix: Optional[str] = None
+) -> ParsedFile:
+    result = ParsedFile()
+    if (suffix or filepath.suffix.lower()) not in _CPP_SUFFIXES:
+        return result
     try:
-        content = filepath.read_text(encoding="utf-8", errors="ignore")
-        for m in re.finditer(r'ros::init\s*\([^,]+,\s*["\']([^"\']+)["\']', content):
-            model.add_node(m.group(1), filepath, base_path)
-    except:
+        if content is None:
+            content = filepath.read_bytes()
+        # Pas d'appel ros::init dans le fichier → pas de regex
+        # (les headers qui n'utilisent que ros::NodeHandle sont écartés aussi)
+        if content.find(b"ros::init") == -1:
+            return result
+        for m in _ROS_INIT_RE.finditer(content):
+            result.nodes.append(m.group(1).decode("utf-8", errors="ignore"))
+    except (OSError, UnicodeDecodeError):
         pass
+    return result
+
+
+# Erreurs attendues sur un fichier launch illisible ou mal formé
+# (ValueError couvre UnicodeDecodeError ; LookupError = encodage inconnu)
+_XML_ERRORS: Tuple[type, ...] = (ET.ParseError, OSError, ValueError, LookupError)
+if _LXML is not None:
+    _XML_ERRORS += (_LXML.XMLSyntaxError,)
+
+
+def _iter_launch_nodes(source):
+    """Éléments <node> d'un document, en streaming (lxml si disponible)"""
+    if _LXML is not None:
+        # Filtrage par tag côté libxml2 ; pas d'entités externes (fichiers uploadés)
+        for _, elem in _LXML.iterparse(
+            source, events=("end",), tag="node",
+            resolve_entities=False, no_network=True
+        ):
+            yield elem
+            elem.clear(keep_tail=True)
+        return
+
+    for _, elem in ET.iterparse(source, events=("end",)):
+        if elem.tag == "node":
+            yield elem
+        elem.clear()
+
+
+# Gros fichiers launch : extraction des attributs name des <node> par
+# regex directement sur le mmap, sans tokenisation XML ni élément alloué
+_LAUNCH_REGEX_MIN_SIZE = 256 * 1024
+# Les attributs précédant name sont consommés par paires attr="valeur"
+# entières : un « name= » à l'intérieur d'une valeur (args="a name=b")
+# ne peut pas être pris pour l'attribut
+_LAUNCH_NODE_RE = re.compile(
+    rb'''<node(?:\s+[\w:.-]+\s*=\s*(?:"[^"]*"|'[^']*'))*?'''
+    rb'''\s+name\s*=\s*(?:"([^"]*)"|'([^']*)')'''
+)
+# Constructions qu'une regex interpréterait mal (entités, commentaires,
+# CDATA) → ces fichiers passent par le parser XML
+_LAUNCH_REGEX_UNSAFE = (b"&", b"<!--", b"<![CDATA[")
+
+
+def _regex_launch_nodes(content) -> Optional[List[str]]:
+    """Noms des <node> par regex, ou None si le fichier doit passer par XML"""
+    if len(content) < _LAUNCH_REGEX_MIN_SIZE:
+        return None
+    for marker in _LAUNCH_REGEX_UNSAFE:
+        if content.find(marker) != -1:
+            return None
+    names = []
+    for m in _LAUNCH_NODE_RE.finditer(content):
+        name = m.group(1) if m.group(1) is not None else m.group(2)
+        if name:
+            names.append(name.decode("utf-8", errors="ignore"))
+    return names
+
+
+# BOM UTF-16 / UTF-32 (le BOM UTF-8 reste compatible ASCII)
+_NON_ASCII_BOMS = (b"\xff\xfe", b"\xfe\xff", b"\x00\x00\xfe\xff")
+_XML_ENCODING_RE = re.compile(rb'''\s*<\?xml[^>]*?encoding\s*=\s*["']([^"']+)["']''')
+
+
+def _ascii_compatible(content) -> bool:
+    """Vrai si les balises sont lisibles telles quelles dans les octets bruts"""
+    head = content[:256]
+    if head.startswith(_NON_ASCII_BOMS) or b"\x00" in head[:2]:
+        return False
+    m = _XML_ENCODING_RE.match(head)
+    if m is None:
+        return True
+    try:
+        return "<node".encode(m.group(1).decode("ascii")) == b"<node"
+    except (LookupError, UnicodeError):
+        # Encodage inconnu → on laisse le parser XML trancher
+        return False
 
 
 # Launch parser
-def parse_launch_file(filepath: Path, model: RosModel, base_path: Path):
-    if not filepath.name.lower().endswith(('.launch', '.xml')):
-        return
+def parse_launch_file(
+    filepath: Path, content: Optional[bytes] = None, suffix: Optional[str] = None
+) -> ParsedFile:
+    result = ParsedFile()
+    # suffix fourni par le dispatch (déjà en minuscules) → pas de .lower()
+    if (suffix or filepath.suffix.lower()) not in _LAUNCH_SUFFIXES:
+        return result
     try:
-        tree = ET.parse(filepath)
-        for node in tree.findall(".//node"):
-            name = node.get("name")
+        if content is None:
+            content = filepath.read_bytes()
+        # Raccourcis sur les octets bruts, seulement si l'encodage est
+        # compatible ASCII (UTF-16 & co passent directement par le parser XML)
+        if _ascii_compatible(content):
+            # Sans balise <node, aucun nœud possible → pas de parse XML
+            # (find plutôt que `in`, qui ne cherche pas de sous-chaîne sur un mmap)
+            if content.find(b"<node") == -1:
+                return result
+            names = _regex_launch_nodes(content)
+            if names is not None:
+                result.nodes.extend(names)
+                return result
+        # Parsing incrémental : chaque élément est vidé dès sa fin, la
+        # mémoire reste proportionnelle à la profondeur et non au document
+        if isinstance(content, bytes):
+            source = io.BytesIO(content)
+        else:
+            source = content  # mmap : déjà lisible comme un fichier
+        names = []
+        for elem in _iter_launch_nodes(source):
+            name = elem.get("name")
             if name:
-                model.add_node(name, filepath, base_path)
-    except:
+                names.append(name)
+        # Fichier mal formé → aucun nœud, comme avec un parse complet
+        result.nodes.extend(names)
+    except _XML_ERRORS:
         pass
+    return result
+
+
+# Dispatch suffixe → parser : une recherche dict par fichier au lieu
+# de la chaîne if/elif
+_PARSERS = {'.py': parse_python_ros_file}
+_PARSERS.update(dict.fromkeys(_CPP_SUFFIXES, parse_cpp_ros_file))
+_PARSERS.update(dict.fromkeys(_LAUNCH_SUFFIXES, parse_launch_file))
+
+
+# Résultats mémoïsés par (nom du fichier, hash du contenu) : un fichier
+# identique d'une analyse à l'autre (ré-upload) n'est pas re-parsé.
+# Le cache vit dans chaque process worker du pool.
+_PARSE_CACHE: Dict[Tuple[str, str], ParsedFile] = {}
+
+# parse_project tourne dans des threads (asyncio.to_thread) : insertion et
+# éviction FIFO des caches mémoire sous verrou, sinon deux analyses
+# concurrentes peuvent évincer la même clé (KeyError)
+_CACHE_LOCK = threading.Lock()
+
+# À incrémenter quand le résultat d'un parser change, pour invalider
+# les entrées persistées sur disque par une version précédente
+PARSER_VERSION = 2
+
+# Empreinte des réglages qui changent le résultat d'un parse (filtre de
+# pertinence) : une entrée écrite sous une autre configuration n'est pas relue
+_SETTINGS_FINGERPRINT = hashlib.blake2b(
+    repr((sorted(settings.RELEVANT_EXTENSIONS), tuple(settings.IGNORED_PATHS))).encode(),
+    digest_size=4
+).hexdigest()
+
+# Préfixe des clés disque : versions du parser et de Python (module ast),
+# empreinte des réglages
+_DISK_KEY_PREFIX = (
+    f"v{PARSER_VERSION}:py{sys.version_info[0]}.{sys.version_info[1]}:{_SETTINGS_FINGERPRINT}"
+)
 
+# Second niveau sur disque (diskcache), partagé par tous les workers et
+# conservé entre redémarrages ; ouvert à la demande dans chaque process
+_DISK_CACHE: Optional[Cache] = None
+
+
+def _disk_cache() -> Cache:
+    global _DISK_CACHE
+    if _DISK_CACHE is None:
+        _DISK_CACHE = Cache(str(settings.PARSE_CACHE_DIR), size_limit=settings.CACHE_SIZE_LIMIT)
+    return _DISK_CACHE
+
+
+# Au-delà de cette taille le fichier est mappé (mmap) au lieu d'être copié
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def _parse_file(filepath: Path) -> ParsedFile:
+    """Lecture unique du fichier, cache par contenu, puis dispatch vers son parser"""
+    try:
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                return _parse_content(filepath, f.read())
+            # Gros fichier : hash, pré-filtre et parse directement sur les
+            # pages mappées, sans copie complète dans le tas
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return _parse_content(filepath, content)
+    except Exception as e:
+        # Un fichier problématique ne doit pas faire échouer toute l'analyse
+        result = ParsedFile()
+        result.warnings.append(f"Parse error {filepath.name}: {str(e)}")
+        return result
+
+
+def _parse_content(filepath: Path, content) -> ParsedFile:
+    """Cache par contenu puis dispatch ; content est des bytes ou un mmap"""
+    # Suffixe mis en minuscules une seule fois, transmis au parser
+    suffix = filepath.suffix.lower()
+    # Le résultat en cache ne dépend que du nom et du contenu : la partie du
+    # filtre de pertinence liée au dossier est donc appliquée avant le cache
+    # (même nom et mêmes octets dans build/ et dans src/ → résultats distincts)
+    if suffix == '.py' and not _dir_is_relevant(os.path.dirname(os.fspath(filepath))):
+        return ParsedFile()
+
+    key = (filepath.name, hashlib.blake2b(content, digest_size=16).hexdigest())
+    cached = _PARSE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    disk_key = f"{_DISK_KEY_PREFIX}:{key[0]}:{key[1]}"
+    result = None
+    if settings.ENABLE_CACHE:
+        try:
+            result = _disk_cache().get(disk_key)
+        except Exception as e:
+            # Cache indisponible → on parse normalement
+            logger.debug("Parse cache read failed: %s", e)
+
+    if result is None:
+        parser = _PARSERS.get(suffix)
+        result = parser(filepath, content, suffix) if parser is not None else ParsedFile()
+
+        if settings.ENABLE_CACHE:
+            try:
+                _disk_cache().set(disk_key, result)
+            except Exception as e:
+                logger.debug("Parse cache write failed: %s", e)
+
+    # Éviction FIFO une fois la taille max atteinte
+    with _CACHE_LOCK:
+        if len(_PARSE_CACHE) >= settings.PARSE_CACHE_SIZE:
+            del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+        _PARSE_CACHE[key] = result
+    return result
+
+
+# Résultats mémoïsés côté coordinateur par (chemin, mtime_ns, taille) :
+# un fichier inchangé depuis la dernière analyse n'est ni relu ni envoyé
+# au pool de workers. En mémoire seulement : les clés contiennent le
+# dossier d'extraction, unique par upload, et ne seraient jamais relues
+# depuis le disque (le cache par contenu y est déjà persisté).
+_STAT_CACHE: Dict[Tuple[str, int, int], ParsedFile] = {}
+
+
+def _stat_key(filepath: Path) -> Optional[Tuple[str, int, int]]:
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (str(filepath), st.st_mtime_ns, st.st_size)
+
+
+def _stat_cache_set(key: Tuple[str, int, int], result: ParsedFile):
+    # Éviction FIFO une fois la taille max atteinte
+    with _CACHE_LOCK:
+        if len(_STAT_CACHE) >= settings.PARSE_CACHE_SIZE:
+            del _STAT_CACHE[next(iter(_STAT_CACHE))]
+        _STAT_CACHE[key] = result
+
+
+# Extensions retenues par le parcours du projet, dans l'ordre de parsing
+# (sources d'abord, launch en dernier)
+_PROJECT_EXTENSIONS = ('.py', '.cpp', '.c', '.h', '.hpp', '.launch', '.xml')
+_PROJECT_SUFFIXES = frozenset(_PROJECT_EXTENSIONS)
+
+
+def _iter_project_files(base_path: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Générateur (extension en minuscules, chemin) sur les fichiers du projet.
+    Parcours itératif os.scandir : seule la pile des dossiers est en mémoire.
+    Dossiers ignorés (build/, devel/...) élagués, .xml gardés seulement
+    si "launch" est dans le nom.
+    """
+    stack = [str(base_path)]
+
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.lower() not in settings.IGNORED_DIRS:
+                            stack.append(entry.path)
+                        continue
+                    name = entry.name.lower()
+                    # Extension par rfind + découpe (méthodes C) plutôt que
+                    # os.path.splitext ; pas d'extension pour ".bashrc" & co
+                    dot = name.rfind('.')
+                    if dot <= 0:
+                        continue
+                    ext = name[dot:]
+                    if ext not in _PROJECT_SUFFIXES:
+                        continue
+                    if ext == '.xml' and "launch" not in name:
+                        continue
+                    yield ext, entry.path
+        except OSError:
+            continue
+
+
+def _prefetch_files(paths: List[Path]):
+    """Demande au noyau de lire les fichiers en avance (POSIX_FADV_WILLNEED)"""
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def collect_project_files(base_path: Path) -> Dict[str, List[Path]]:
+    """
+    Fichiers du projet regroupés par extension, chaque groupe trié
+    (ordre de parsing déterministe). Le tri se fait sur les chaînes,
+    les Path ne sont construits qu'ensuite.
+    """
+    paths: Dict[str, List[str]] = {ext: [] for ext in _PROJECT_EXTENSIONS}
+    for ext, path in _iter_project_files(base_path):
+        paths[ext].append(path)
+
+    files: Dict[str, List[Path]] = {}
+    for ext, bucket in paths.items():
+        # Tri par composants, comme le tri de Path (pas l'ordre brut des
+        # chaînes : "a-b/c.py" < "a/b.py" en chaîne mais pas en Path)
+        bucket.sort(key=lambda p: p.split(os.sep))
+        files[ext] = [Path(p) for p in bucket]
+    return files
+
+
+# Intervalle (secondes) entre deux logs de progression du parsing
+_PROGRESS_LOG_INTERVAL = 5.0
+
+
+def parse_project(
+    project_dir: Path,
+    executor: Optional[Executor] = None,
+    n_procs: Optional[int] = 1,
+) -> RosModel:
+    """
+    Parse toutes les sources ROS d'un projet.
+
+    Chaque fichier est parsé indépendamment (en parallèle si un executor,
+    ex. ProcessPoolExecutor, est fourni), puis rejoué dans un seul RosModel
+    dans l'ordre de parsing : la gestion des doublons (sources d'abord)
+    est inchangée. Sans executor, n_procs > 1 (ou None, un par CPU) utilise
+    un pool temporaire ; n_procs=1 garde le parsing séquentiel.
+    """
+    if executor is None and n_procs != 1:
+        # Pas de fork : le thread de readahead tourne déjà quand les workers
+        # démarrent (fork d'un process multi-thread → deadlocks possibles)
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(
+            max_workers=n_procs,
+            mp_context=multiprocessing.get_context(start_method)
+        ) as pool:
+            return parse_project(project_dir, pool)
 
-def parse_project(project_dir: Path) -> RosModel:
     model = RosModel()
     base_path = project_dir
 
-    # Sources
-    for ext in ['.py', '.cpp', '.c', '.h', '.hpp']:
-        for f in base_path.rglob(f'*{ext}'):
-            if ext == '.py':
-                parse_python_ros_file(f, model, base_path)
-            else:
-                parse_cpp_ros_file(f, model, base_path)
-
-    # Launch
-    for f in base_path.rglob("*.launch"):
-        parse_launch_file(f, model, base_path)
-    for f in base_path.rglob("*.xml"):
-        if "launch" in f.name.lower():
-            parse_launch_file(f, model, base_path)
+    # Un seul parcours du projet au lieu d'un rglob par extension
+    files = collect_project_files(base_path)
+
+    # Sources d'abord, launch en dernier ; une seule liste construite
+    # (l'ordre global compte : il décide quel doublon de nœud est gardé)
+    ordered = [f for ext in _PROJECT_EXTENSIONS for f in files[ext]]
+
+    # Fichiers inchangés servis par le cache stat, seul le reste est parsé
+    keys = [_stat_key(f) for f in ordered]
+    results: List[Optional[ParsedFile]] = [
+        _STAT_CACHE.get(key) if key is not None else None for key in keys
+    ]
+    missing = [i for i, result in enumerate(results) if result is None]
+    todo = [ordered[i] for i in missing]
+
+    # Cache disque froid : readahead noyau lancé en tâche de fond, les
+    # lectures des workers trouvent les pages déjà (ou bientôt) en mémoire
+    if len(todo) >= settings.PARSE_PARALLEL_MIN_FILES and hasattr(os, "posix_fadvise"):
+        threading.Thread(target=_prefetch_files, args=(todo,), daemon=True).start()
+
+    # Petits projets : le coût d'envoi aux workers dépasse le gain
+    if executor is None or len(todo) < settings.PARSE_PARALLEL_MIN_FILES:
+        parsed = map(_parse_file, todo)
+    else:
+        parsed = executor.map(_parse_file, todo, chunksize=32)
+
+    # Progression loguée au plus toutes les _PROGRESS_LOG_INTERVAL secondes :
+    # un gros workspace bloqué sur un fichier reste identifiable
+    total = len(todo)
+    next_log = time.monotonic() + _PROGRESS_LOG_INTERVAL
+    for done, (i, result) in enumerate(zip(missing, parsed), 1):
+        results[i] = result
+        if keys[i] is not None:
+            _stat_cache_set(keys[i], result)
+        now = time.monotonic()
+        if now >= next_log:
+            logger.info("Parsing %s: %d/%d files", project_dir.name, done, total)
+            next_log = now + _PROGRESS_LOG_INTERVAL
+
+    # Chemin relatif par simple découpe de chaîne sur un préfixe calculé
+    # une fois, au lieu de Path.relative_to (comparaison partie par partie).
+    # Path(".") se normalise sans "./" → préfixe vide dans ce cas
+    base_str = os.fspath(base_path)
+    prefix = "" if base_str == "." else base_str.rstrip(os.sep) + os.sep
+    cut = len(prefix)
+
+    for f, result in zip(ordered, results):
+        path = os.fspath(f)
+        clean_file = path[cut:] if path.startswith(prefix) else f.name
+        result.apply(model, clean_file)
 
     return model
@@ -0,0 +1,69 @@
+# backend/tests/test_extract_zip.py
+"""
+Regression tests for ZIP extraction (zip slip checks and threaded copy)
+"""
+
+import io
+import zipfile
+
+import pytest
+
+from app.main import extract_zip
+
+
+def make_zip(members) -> io.BytesIO:
+    """Build an in-memory archive from (name, data) pairs"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in members:
+            z.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def test_rejects_parent_directory_member(tmp_path):
+    archive = make_zip([("pkg/ok.py", b"ok"), ("../evil.py", b"x")])
+    target = tmp_path / "out"
+    target.mkdir()
+
+    with pytest.raises(ValueError, match="Unsafe path"):
+        extract_zip(archive, target)
+
+    assert not (tmp_path / "evil.py").exists()
+
+
+def test_rejects_absolute_member(tmp_path):
+    archive = make_zip([("/tmp/evil.py", b"x")])
+    target = tmp_path / "out"
+    target.mkdir()
+
+    with pytest.raises(ValueError, match="Unsafe path"):
+        extract_zip(archive, target)
+
+
+def test_allows_inner_parent_reference(tmp_path):
+    # a/../b stays inside the folder once normalized
+    archive = make_zip([("a/../b/node.py", b"import rospy\n")])
+    target = tmp_path / "out"
+    target.mkdir()
+
+    assert extract_zip(archive, target) == 1
+    assert (target / "b" / "node.py").read_bytes() == b"import rospy\n"
+
+
+def test_extracts_many_members_on_thread_pool(tmp_path):
+    # Enough members (some larger than the copy buffer chunks) to keep
+    # several pool threads reading the shared ZipFile at once
+    members = [
+        (f"pkg{i % 7}/src/file_{i}.py", (f"# {i}\n".encode() * (1000 + i * 50)))
+        for i in range(64)
+    ]
+    members.append(("pkg0/empty/", b""))
+    archive = make_zip(members)
+    target = tmp_path / "out"
+    target.mkdir()
+
+    assert extract_zip(archive, target) == 64
+    for name, data in members[:-1]:
+        assert (target / name).read_bytes() == data
+    assert (target / "pkg0" / "empty").is_dir()
@@ -0,0 +1,115 @@
+# backend/tests/test_parse_project.py
+"""
+Pooled parsing must build the same RosModel as serial parsing
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app import parsers
+from app.config import settings
+from app.parsers import RosModel, parse_project
+
+
+TALKER = b'''import rospy
+from std_msgs.msg import String
+
+def talker():
+    rospy.init_node("talker")
+    pub = rospy.Publisher("chatter", String, queue_size=10)
+    rate = rospy.Rate(10)
+'''
+
+LISTENER = b'''import rospy
+from std_msgs.msg import String
+
+rospy.init_node("listener")
+rospy.Subscriber("chatter", String, lambda msg: None)
+rospy.get_param("~rate")
+'''
+
+NO_RATE = b'''import rospy
+from geometry_msgs.msg import Twist
+
+rospy.init_node("driver")
+rospy.Publisher("cmd_vel", Twist)
+'''
+
+CPP_NODE = b'''#include <ros/ros.h>
+int main() { ros::M_string remappings; ros::init(remappings, "cpp_node"); }
+'''
+
+LAUNCH = b'''<launch>
+  <node pkg="demo" type="talker.py" name="talker"/>
+  <node pkg="demo" type="camera" name="camera"/>
+</launch>
+'''
+
+
+def snapshot(model: RosModel):
+    """Comparable view of everything the API projects out of a model"""
+    return (
+        [(n.name, n.file) for n in model.nodes],
+        {t.name: (t.message_type, t.publishers, t.subscribers) for t in model.topics.values()},
+        {s.name: (s.type, s.servers, s.clients) for s in model.services.values()},
+        sorted(model.parameters),
+        model.warnings,
+    )
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    # Fresh caches and no disk tier, so every run really parses; pool
+    # dispatch forced even for this small tree
+    monkeypatch.setattr(settings, "ENABLE_CACHE", False)
+    monkeypatch.setenv("ENABLE_CACHE", "false")  # read by pool workers at import
+    monkeypatch.setattr(settings, "PARSE_PARALLEL_MIN_FILES", 1)
+    monkeypatch.setattr(parsers, "_PARSE_CACHE", {})
+    monkeypatch.setattr(parsers, "_STAT_CACHE", {})
+
+    files = {
+        "demo/scripts/talker.py": TALKER,
+        "demo/scripts/listener.py": LISTENER,
+        "demo/scripts/driver.py": NO_RATE,
+        "demo/src/cpp_node.cpp": CPP_NODE,
+        "demo/launch/demo.launch": LAUNCH,
+        "demo/build/talker.py": TALKER,  # pruned
+    }
+    for i in range(40):
+        files[f"demo/src/extra_{i}.py"] = b"import os\n"
+    for name, data in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return tmp_path
+
+
+def clear_caches():
+    parsers._PARSE_CACHE.clear()
+    parsers._STAT_CACHE.clear()
+
+
+def test_temporary_pool_matches_serial(project):
+    serial = snapshot(parse_project(project))
+    clear_caches()
+    pooled = snapshot(parse_project(project, n_procs=2))
+
+    assert pooled == serial
+    assert [name for name, _ in serial[0]] == ["driver", "listener", "talker", "cpp_node", "camera"]
+
+
+def test_forkserver_executor_matches_serial(project):
+    serial = snapshot(parse_project(project))
+    clear_caches()
+
+    # Same pool setup as the server lifespan in main.py
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(
+        max_workers=2,
+        mp_context=multiprocessing.get_context(start_method)
+    ) as pool:
+        pooled = snapshot(parse_project(project, pool))
+
+    assert pooled == serial